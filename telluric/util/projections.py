@@ -1,24 +1,121 @@
 """Projection utilities.
 
 """
-from functools import partial
+from functools import partial, lru_cache
 
+import numpy as np
 import pyproj
 from shapely import ops
+from shapely.geometry import (
+    Point, MultiPoint, Polygon, MultiPolygon, LineString, MultiLineString)
 
 from telluric.constants import WGS84_CRS
 
 
-def generate_transform(source_crs, destination_crs):
-    original = pyproj.Proj(dict(source_crs), preserve_units=True)
-    destination = pyproj.Proj(dict(destination_crs), preserve_units=True)
+# WGS84 (which is also the default CRS) takes part in most transformations
+_WGS84_KEY = tuple(sorted(dict(WGS84_CRS).items()))
+
+
+def _crs_key(crs):
+    """Returns a hashable representation of a CRS given as key/value pairs or proj4 string."""
+    if crs is WGS84_CRS:
+        return _WGS84_KEY
+    elif isinstance(crs, str):
+        return crs
+
+    return tuple(sorted(dict(crs).items()))
+
+
+@lru_cache(maxsize=32)
+def _get_proj(crs_key):
+    # Shared by all the transformations involving the same CRS
+    crs = crs_key if isinstance(crs_key, str) else dict(crs_key)
+    return pyproj.Proj(crs, preserve_units=True)
 
-    transformation = partial(
+
+@lru_cache(maxsize=128)
+def _get_transformation(source_key, destination_key):
+    # Building the projections is by far the most expensive part of a transform,
+    # so we keep them around for the most recently used pairs of CRS
+    original = _get_proj(source_key)
+    destination = _get_proj(destination_key)
+
+    if hasattr(pyproj, 'Transformer'):
+        # Since pyproj 2, pyproj.transform builds a new Transformer on every call
+        return pyproj.Transformer.from_proj(original, destination, always_xy=True).transform
+
+    return partial(
         pyproj.transform,
         original, destination
     )
 
-    return partial(ops.transform, transformation)
+
+def _coordinate_arrays(shape):
+    """Gets the coordinate sequences of a shape as arrays, in a stable order."""
+    if isinstance(shape, (Point, LineString)):  # LinearRing is a LineString
+        return [np.asarray(shape.coords)]
+    elif isinstance(shape, Polygon):
+        return [np.asarray(ring.coords) for ring in [shape.exterior] + list(shape.interiors)]
+    elif isinstance(shape, (MultiPoint, MultiLineString, MultiPolygon)):
+        return [array for part in shape.geoms for array in _coordinate_arrays(part)]
+    else:
+        raise TypeError("Unsupported geometry type '{}'".format(shape.type))
+
+
+def _from_coordinate_arrays(shape, arrays):
+    """Builds a shape like the given one taking its coordinates from an iterator of arrays."""
+    if isinstance(shape, Point):
+        return Point(next(arrays)[0])
+    elif isinstance(shape, LineString):
+        return type(shape)(next(arrays))
+    elif isinstance(shape, Polygon):
+        shell = next(arrays)
+        holes = [next(arrays) for _ in shape.interiors]
+        return Polygon(shell, holes)
+    else:
+        return type(shape)([_from_coordinate_arrays(part, arrays) for part in shape.geoms])
+
+
+def _transform_shapes(func, shapes):
+    """Like :py:func:`shapely.ops.transform` for several shapes, but calls func only once for all of them.
+
+    shapely calls func once per coordinate sequence, so multipart geometries, polygons
+    with holes and lists of shapes end up making many calls to pyproj.
+
+    """
+    arrays_by_shape = []
+    for shape in shapes:
+        try:
+            arrays_by_shape.append(None if shape.is_empty else _coordinate_arrays(shape))
+        except TypeError:
+            # Geometry collections
+            arrays_by_shape.append(None)
+
+    arrays = [array for shape_arrays in arrays_by_shape if shape_arrays is not None for array in shape_arrays]
+    try:
+        coords = np.concatenate(arrays)
+    except ValueError:
+        # Nothing to transform at once, or mixed dimensions
+        return [ops.transform(func, shape) for shape in shapes]
+
+    new_coords = np.column_stack(func(*coords.T))
+    offsets = np.cumsum([len(array) for array in arrays])[:-1]
+    new_arrays = iter(np.split(new_coords, offsets))
+
+    return [
+        ops.transform(func, shape) if shape_arrays is None else _from_coordinate_arrays(shape, new_arrays)
+        for shape, shape_arrays in zip(shapes, arrays_by_shape)
+    ]
+
+
+def _transform_shape(func, shape):
+    return _transform_shapes(func, [shape])[0]
+
+
+def generate_transform(source_crs, destination_crs):
+    transformation = _get_transformation(_crs_key(source_crs), _crs_key(destination_crs))
+
+    return partial(_transform_shape, transformation)
 
 
 def transform(shape, source_crs, destination_crs=None, src_affine=None, dst_affine=None):
@@ -55,3 +152,29 @@ def transform(shape, source_crs, destination_crs=None, src_affine=None, dst_affi
         shape = ops.transform(lambda r, q: dst_affine * (r, q), shape)
 
     return shape
+
+
+def transform_shapes(shapes, source_crs, destination_crs=None):
+    """Transforms several shapes from the same CRS to another one at once.
+
+    Parameters
+    ----------
+    shapes : list of shapely.geometry.base.BaseGeometry
+        Shapes to transform.
+    source_crs : dict or str
+        Source CRS in the form of key/value pairs or proj4 string.
+    destination_crs : dict or str, optional
+        Destination CRS, EPSG:4326 if not given.
+
+    Returns
+    -------
+    list of shapely.geometry.base.BaseGeometry
+        Transformed shapes.
+
+    """
+    if destination_crs is None:
+        destination_crs = WGS84_CRS
+
+    transformation = _get_transformation(_crs_key(source_crs), _crs_key(destination_crs))
+
+    return _transform_shapes(transformation, list(shapes))
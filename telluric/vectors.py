@@ -1,19 +1,25 @@
 import json
+import operator
+from collections import defaultdict
+from typing import Union
 
 import numpy as np
 
 import shapely.geometry
+import shapely.wkt
+from shapely.strtree import STRtree
 from shapely.geometry import (
     shape as to_shape,
     Point, MultiPoint, Polygon, MultiPolygon, LineString, MultiLineString,
     CAP_STYLE,
     mapping)
+from shapely.geometry.base import BaseGeometry
 
 from rasterio.crs import CRS
 
 from telluric.constants import DEFAULT_CRS, EQUAL_AREA_CRS, WGS84_CRS
 from telluric.plotting import NotebookPlottingMixin
-from telluric.util.projections import transform
+from telluric.util.projections import transform, transform_shapes, _crs_key
 
 
 # From shapely.geometry.base.BaseGeometry
@@ -59,6 +65,17 @@ GEOM_BINARY_PREDICATES = [
     # 'almost_equals',  # Requires extra parameter
     # 'relate_pattern',
 ]
+# Binary predicates that can only hold if the bounding boxes of both shapes intersect
+GEOM_BINARY_ENVELOPE_PREDICATES = [
+    'covers',
+    'contains',
+    'crosses',
+    'equals',
+    'intersects',
+    'overlaps',
+    'touches',
+    'within',
+]
 GEOM_NONVECTOR_PROPERTIES = [
     'xy',
     'x', 'y',
@@ -67,22 +84,83 @@ GEOM_NONVECTOR_PROPERTIES = [
     'interiors',
 ]
 
+# Polygon() is an empty geometry collection before shapely 1.8
+_EMPTY_POLYGON = shapely.wkt.loads('POLYGON EMPTY')
+
+# Nesting levels of the GeoJSON coordinates above a single position
+_COORDINATES_DEPTH = {
+    'Point': 0,
+    'LineString': 1,
+    'MultiPoint': 1,
+    'Polygon': 2,
+    'MultiLineString': 2,
+    'MultiPolygon': 3,
+}
+
 
 def get_dimension(geometry):
     """Gets the dimension of a Fiona-like geometry element."""
-    coordinates = geometry["coordinates"]
     type_ = geometry["type"]
-    if type_ in ('Point',):
-        return len(coordinates)
-    elif type_ in ('LineString', 'MultiPoint'):
-        return len(coordinates[0])
-    elif type_ in ('Polygon', 'MultiLineString'):
-        return len(coordinates[0][0])
-    elif type_ in ('MultiPolygon',):
-        return len(coordinates[0][0][0])
-    else:
+    try:
+        depth = _COORDINATES_DEPTH[type_]
+    except KeyError:
         raise ValueError("Invalid type '{}'".format(type_))
 
+    # The nesting depth is fixed by the type, no need to inspect the elements
+    coordinates = geometry["coordinates"]
+    for _ in range(depth):
+        coordinates = coordinates[0]
+
+    return len(coordinates)
+
+
+def _circle(center_x, center_y, radius, resolution=16):
+    """Polygonal approximation of a circle, like the buffer of a point with the same resolution."""
+    # GEOS buffer shells start at (x + r, y) and run clockwise
+    angles = -np.linspace(0, 2 * np.pi, 4 * resolution, endpoint=False)
+    ring = np.column_stack([center_x + radius * np.cos(angles), center_y + radius * np.sin(angles)])
+    return Polygon(ring)
+
+
+def _is_own_envelope(shape):
+    """Checks whether a shape is identical, vertex for vertex, to the envelope GEOS computes for it."""
+    if type(shape) is not Polygon or len(shape.interiors):
+        return False
+
+    exterior_coords = shape.exterior.coords
+    if len(exterior_coords) != 5:
+        return False
+
+    minx, miny, maxx, maxy = shape.bounds
+    if minx == maxx or miny == maxy:
+        # GEOS gives back a point or a line for degenerate bounds
+        return False
+
+    # GEOS envelopes run counter-clockwise from the lower left corner
+    return np.array_equal(
+        np.asarray(exterior_coords),
+        [[minx, miny], [maxx, miny], [maxx, maxy], [minx, maxy], [minx, miny]]
+    )
+
+
+def _rectangles_from_bounds(xmins, ymins, xmaxs, ymaxs):
+    """Yields rectangular polygons for arrays of bounds.
+
+    The exterior rings of all the rectangles are computed at once in a single
+    float64 array, with the same vertex order as :py:meth:`Polygon.from_bounds`,
+    so that shapely only has to copy the coordinates from the array buffer.
+
+    """
+    rings = np.stack([
+        np.column_stack([xmins, ymins]),
+        np.column_stack([xmins, ymaxs]),
+        np.column_stack([xmaxs, ymaxs]),
+        np.column_stack([xmaxs, ymins]),
+    ], axis=1).astype(np.float64)
+
+    for ring in rings:
+        yield Polygon(ring)
+
 
 def generate_tile_coordinates(roi, num_tiles):
     """Yields N x M rectangular tiles for a region of interest.
@@ -104,14 +182,37 @@ def generate_tile_coordinates(roi, num_tiles):
     x_range = np.linspace(bounds[0], bounds[2], num_tiles[0] + 1)
     y_range = np.linspace(bounds[1], bounds[3], num_tiles[1] + 1)
 
-    for y_start, y_end in zip(y_range[:-1], y_range[1:]):
-        for x_start, x_end in zip(x_range[:-1], x_range[1:]):
-            new_roi = GeoVector(
-                Polygon.from_bounds(x_start, y_start, x_end, y_end),
-                roi.crs
-            )
+    # Rows go along y, so tiles are yielded left to right, then bottom to top
+    x_starts, y_starts = np.meshgrid(x_range[:-1], y_range[:-1])
+    x_ends, y_ends = np.meshgrid(x_range[1:], y_range[1:])
+
+    for shape in _rectangles_from_bounds(x_starts.ravel(), y_starts.ravel(), x_ends.ravel(), y_ends.ravel()):
+        yield GeoVector(shape, roi.crs)
+
+
+def _compute_tile_bounds(bounds, width, height):
+    """Computes the bounds of the tiles of a given size covering some bounds.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of shape (N, 4) with the (xmin, ymin, xmax, ymax) of every tile,
+        left to right, then bottom to top.
+
+    """
+    minx, miny, maxx, maxy = bounds
+
+    num_w = int(np.ceil((maxx - minx) / width))
+    num_h = int(np.ceil((maxy - miny) / height))
 
-            yield new_roi
+    # Adjacent tiles take their shared edge from the same element
+    x_edges = minx + np.arange(num_w + 1) * width
+    y_edges = miny + np.arange(num_h + 1) * height
+
+    x_starts, y_starts = np.meshgrid(x_edges[:-1], y_edges[:-1])
+    x_ends, y_ends = np.meshgrid(x_edges[1:], y_edges[1:])
+
+    return np.stack((x_starts.ravel(), y_starts.ravel(), x_ends.ravel(), y_ends.ravel()), axis=-1)
 
 
 def generate_tile_coordinates_from_pixels(roi, scale, size):
@@ -137,104 +238,111 @@ def generate_tile_coordinates_from_pixels(roi, scale, size):
     width = size[0] * scale
     height = size[1] * scale
 
-    minx, miny, maxx, maxy = roi.get_shape(roi.crs).bounds
-
-    num_w = np.ceil((maxx - minx) / width)
-    num_h = np.ceil((maxy - miny) / height)
-
-    new_roi = GeoVector.from_bounds(
-        xmin=minx, ymin=miny,
-        xmax=minx + num_w * width, ymax=miny + num_h * height,
-        crs=roi.crs
-    )
-
-    yield from generate_tile_coordinates(new_roi, (num_w, num_h))
+    tile_bounds = _compute_tile_bounds(roi.get_shape(roi.crs).bounds, width, height)
 
+    for shape in _rectangles_from_bounds(*tile_bounds.T):
+        yield GeoVector(shape, roi.crs)
 
-class _GeoVectorDelegator:
-    def __getattr__(self, item):
-        if item in GEOM_PROPERTIES:
-            def delegated_(self_):
-                return self_.__class__(getattr(self_.get_shape(self_.crs), item), self_.crs)
-
-            # Use class docstring to properly translate properties, see
-            # https://stackoverflow.com/a/38118315/554319
-            delegated_.__doc__ = getattr(self._shape.__class__, item).__doc__
 
-            # Transform to a property
-            delegated_property = property(delegated_)
+def bulk_predicate(predicate_name, vectors, others):
+    """Evaluates a binary predicate between every vector and a list of other vectors.
 
-            # Bind the property
-            setattr(self.__class__, item, delegated_property)
+    A spatial index is built once over the other vectors, so the predicate is only
+    evaluated for the pairs whose bounding boxes intersect.
 
-        elif item in GEOM_NONVECTOR_PROPERTIES:
-            def delegated_(self_):
-                return getattr(self_.get_shape(self_.crs), item)
-
-            # Use class docstring to properly translate properties, see
-            # https://stackoverflow.com/a/38118315/554319
-            delegated_.__doc__ = getattr(self._shape.__class__, item).__doc__
+    Parameters
+    ----------
+    predicate_name : str
+        Name of the predicate, one of :py:data:`GEOM_BINARY_ENVELOPE_PREDICATES`.
+    vectors : iterable of ~telluric.vectors.GeoVector
+        Vectors to test.
+    others : list of ~telluric.vectors.GeoVector
+        Vectors to test against.
+
+    Returns
+    -------
+    list
+        For every vector, sorted list of the indices of other vectors for which the predicate holds.
 
-            # Transform to a property
-            delegated_property = property(delegated_)
+    """
+    if predicate_name not in GEOM_BINARY_ENVELOPE_PREDICATES:
+        raise ValueError("Predicate '{}' can not be evaluated in bulk".format(predicate_name))
 
-            # Bind the property
-            setattr(self.__class__, item, delegated_property)
+    if not others:
+        return [[] for _ in vectors]
 
-        elif item in GEOM_UNARY_PREDICATES:
-            def delegated_(self_):
-                return getattr(self_.get_shape(self_.crs), item)
+    crs = others[0].crs
+    shapes = [other.get_shape(crs) for other in others]
 
-            # Use class docstring to properly translate properties, see
-            # https://stackoverflow.com/a/38118315/554319
-            delegated_.__doc__ = getattr(self._shape.__class__, item).__doc__
+    # The tree gives back the very same objects that were inserted
+    indices_by_id = defaultdict(list)
+    for ii, shape in enumerate(shapes):
+        indices_by_id[id(shape)].append(ii)
 
-            # Transform to a property
-            delegated_property = property(delegated_)
+    tree = STRtree(shapes)
 
-            # Bind the property
-            setattr(self.__class__, item, delegated_property)
+    result = []
+    for vector in vectors:
+        shape = vector.get_shape(crs)
+        predicate = getattr(shape, predicate_name)
+        result.append(sorted(
+            ii
+            for candidate in tree.query(shape) if predicate(candidate)
+            for ii in indices_by_id[id(candidate)]
+        ))
 
-        elif item in GEOM_BINARY_PREDICATES:
-            def delegated_predicate(self_, other):
-                return getattr(self_.get_shape(self_.crs), item)(
-                    other.get_shape(self_.crs))
+    return result
 
-            delegated_predicate.__doc__ = getattr(self._shape, item).__doc__
 
-            # Bind the attribute
-            setattr(self.__class__, item, delegated_predicate)
+def reproject_vectors(vectors, new_crs):
+    """Reprojects several vectors at once.
 
-        elif item in GEOM_BINARY_OPERATIONS:
-            def delegated_operation(self_, other):
-                return self_.__class__(
-                    getattr(self_.get_shape(self_.crs), item)(other.get_shape(self_.crs)),
-                    self_.crs
-                )
+    The coordinates of all the vectors sharing the same CRS are transformed
+    with a single call to pyproj.
 
-            delegated_operation.__doc__ = getattr(self._shape, item).__doc__
+    Parameters
+    ----------
+    vectors : iterable of ~telluric.vectors.GeoVector
+        Vectors to reproject.
+    new_crs : ~rasterio.crs.CRS, dict
+        Destination CRS.
 
-            # Bind the attribute
-            setattr(self.__class__, item, delegated_operation)
+    Returns
+    -------
+    list of ~telluric.vectors.GeoVector
 
-        elif item in GEOM_UNARY_OPERATIONS:
-            # We rename to make MyPy happy
-            def delegated_operation_special(self_, *args, **kwargs):
-                return self_.__class__(
-                    getattr(self_.get_shape(self_.crs), item)(*args, **kwargs),
-                    self_.crs
-                )
+    """
+    vectors = list(vectors)
+    result = list(vectors)  # Vectors already in the new CRS are returned as they are
+
+    # Group the indices of the vectors to reproject by their CRS
+    groups = []  # type: list
+    for ii, vector in enumerate(vectors):
+        crs = vector.crs
+        if crs is new_crs or crs == new_crs:
+            continue
+
+        for group_crs, indices in groups:
+            if crs is group_crs or crs == group_crs:
+                indices.append(ii)
+                break
+        else:
+            groups.append((crs, [ii]))
 
-            delegated_operation_special.__doc__ = getattr(self._shape, item).__doc__
+    for crs, indices in groups:
+        new_shapes = transform_shapes([vectors[ii].get_shape(crs) for ii in indices], crs, new_crs)
+        for ii, new_shape in zip(indices, new_shapes):
+            result[ii] = vectors[ii].__class__(new_shape, new_crs)
 
-            # Bind the attribute
-            setattr(self.__class__, item, delegated_operation_special)
+    return result
 
-        else:
-            raise AttributeError("'{}' object has no attribute '{}'".format(self.__class__, item))
 
-        # Return the newly bound attribute
-        return getattr(self, item)
+class _GeoVectorDelegator:
+    def __getattr__(self, item):
+        # Delegated attributes are bound to GeoVector when the module is loaded
+        # (see the end of this module), so anything reaching here does not exist.
+        # Defining __getattr__ also lets static type checkers know about them.
+        raise AttributeError("'{}' object has no attribute '{}'".format(self.__class__, item))
 
 
 class GeoVector(_GeoVectorDelegator, NotebookPlottingMixin):
@@ -257,6 +365,8 @@ class GeoVector(_GeoVectorDelegator, NotebookPlottingMixin):
         """
         self._shape = shape  # type: shapely.geometry.base.BaseGeometry
         self._crs = crs
+        self._point_coordinates = None  # type: Union[None, tuple]
+        self._last_reprojection = None  # type: Union[None, tuple]
 
     @classmethod
     def from_geojson(cls, filename):
@@ -271,8 +381,9 @@ class GeoVector(_GeoVectorDelegator, NotebookPlottingMixin):
 
     def to_geojson(self, filename):
         """Save vector as geojson."""
+        # json.dump always uses the pure Python encoder, json.dumps can use the C one
         with open(filename, 'w') as fd:
-            json.dump(self.to_record(WGS84_CRS), fd)
+            fd.write(json.dumps(self.to_record(WGS84_CRS)))
 
     @classmethod
     def point(cls, x, y, crs=DEFAULT_CRS):
@@ -304,7 +415,18 @@ class GeoVector(_GeoVectorDelegator, NotebookPlottingMixin):
         GeoVector(shape=POLYGON ((0 0, 0 1, 1 1, 1 0, 0 0)), crs=CRS({'init': 'epsg:4326'}))
 
         """
-        return cls(Polygon.from_bounds(xmin, ymin, xmax, ymax), crs)
+        # Same vertex order as Polygon.from_bounds, but shapely reads the array buffer directly
+        ring = np.array([[xmin, ymin], [xmin, ymax], [xmax, ymax], [xmax, ymin]], dtype=np.float64)
+        return cls(Polygon(ring), crs)
+
+    @classmethod
+    def bulk_predicate(cls, predicate_name, vectors, others):
+        """Evaluates a binary predicate between every vector and a list of other vectors.
+
+        See :py:func:`telluric.vectors.bulk_predicate`.
+
+        """
+        return bulk_predicate(predicate_name, vectors, others)
 
     @property
     def __geo_interface__(self):
@@ -322,6 +444,37 @@ class GeoVector(_GeoVectorDelegator, NotebookPlottingMixin):
     def type(self):
         return self._shape.type
 
+    def _get_point_coordinates(self):
+        # Point.x and Point.y build a new coordinate sequence on every access
+        if self._point_coordinates is None:
+            self._point_coordinates = self._shape.coords[0]
+
+        return self._point_coordinates
+
+    @property
+    def x(self):
+        """Return x coordinate."""
+        if not isinstance(self._shape, Point):
+            return self._shape.x
+
+        return self._get_point_coordinates()[0]
+
+    @property
+    def y(self):
+        """Return y coordinate."""
+        if not isinstance(self._shape, Point):
+            return self._shape.y
+
+        return self._get_point_coordinates()[1]
+
+    @property
+    def envelope(self):
+        """Bounding box of the vector, the vector itself if it already is its own envelope."""
+        if _is_own_envelope(self._shape):
+            return self
+
+        return self.__class__(self._shape.envelope, self.crs)
+
     def to_record(self, crs):
         data = mapping(self.get_shape(crs))
         if data['type'] == 'LinearRing':
@@ -336,16 +489,27 @@ class GeoVector(_GeoVectorDelegator, NotebookPlottingMixin):
         to force the user to specify it.
 
         """
-        if crs == self.crs:
+        # Most callers pass self.crs itself, which avoids comparing the CRS item by item
+        if crs is self._crs or crs == self._crs:
             return self._shape
-        else:
-            return self.reproject(crs)._shape
+
+        # Vectors are often compared repeatedly against others in the same foreign CRS.
+        # Keep a snapshot of the CRS, the object given might be modified afterwards.
+        crs_key = _crs_key(crs)
+        if self._last_reprojection is not None:
+            last_crs_key, last_shape = self._last_reprojection
+            if crs_key == last_crs_key:
+                return last_shape
+
+        shape = self.reproject(crs)._shape
+        self._last_reprojection = (crs_key, shape)
+        return shape
 
     def _repr_svg_(self):
         return self._shape._repr_svg_()
 
     def reproject(self, new_crs):
-        if new_crs == self.crs:
+        if new_crs is self._crs or new_crs == self._crs:
             return self
         else:
             new_shape = transform(self._shape, self._crs, new_crs)
@@ -371,16 +535,27 @@ class GeoVector(_GeoVectorDelegator, NotebookPlottingMixin):
     def almost_equals(self, other, decimal=6):
         """ invariant to crs. """
         # This method cannot be delegated because it has an extra parameter
-        return self._shape.almost_equals(other.get_shape(self.crs), decimal=decimal)
+        # Same tolerance as shapely's almost_equals, without the extra call
+        return self._shape.equals_exact(other.get_shape(self.crs), 0.5 * 10 ** (-decimal))
 
     def polygonize(self, width, cap_style_line=CAP_STYLE.flat, cap_style_point=CAP_STYLE.round):
         """Turns line or point into a buffered polygon."""
         shape = self._shape
-        if isinstance(shape, (LineString, MultiLineString)):
+        if isinstance(shape, (LineString, MultiLineString, Point, MultiPoint)) and width <= 0:
+            # Buffering by a non positive distance always gives an empty polygon,
+            # which is what collections rasterize with the default width
+            return self.__class__(_EMPTY_POLYGON, self.crs)
+        elif isinstance(shape, (LineString, MultiLineString)):
             return self.__class__(
                 shape.buffer(width / 2, cap_style=cap_style_line),
                 self.crs
             )
+        elif isinstance(shape, Point) and cap_style_point == CAP_STYLE.round and not shape.is_empty:
+            # Computing the vertices directly is much cheaper than going through GEOS buffer
+            return self.__class__(
+                _circle(shape.x, shape.y, width / 2),
+                self.crs
+            )
         elif isinstance(shape, (Point, MultiPoint)):
             return self.__class__(
                 shape.buffer(width / 2, cap_style=cap_style_point),
@@ -391,7 +566,9 @@ class GeoVector(_GeoVectorDelegator, NotebookPlottingMixin):
 
     def __eq__(self, other):
         """ invariant to crs and topology."""
-        return self.equals(other)
+        # Identical coordinates are much cheaper to check than topological equality
+        other_shape = other.get_shape(self.crs)
+        return self._shape.equals_exact(other_shape, 0.0) or self._shape.equals(other_shape)
 
     def __str__(self):
         return '{cls}(shape={shape}, crs={crs})'.format(
@@ -399,3 +576,67 @@ class GeoVector(_GeoVectorDelegator, NotebookPlottingMixin):
 
     def __repr__(self):
         return str(self)
+
+
+def _shapely_doc(name):
+    # Use class docstring to properly translate properties, see
+    # https://stackoverflow.com/a/38118315/554319
+    for cls in (BaseGeometry, Point, Polygon):
+        if hasattr(cls, name):
+            return getattr(cls, name).__doc__
+
+
+def _delegated_property(name):
+    def delegated_(self_):
+        return self_.__class__(getattr(self_._shape, name), self_.crs)
+
+    delegated_.__name__ = name
+    return property(delegated_, doc=_shapely_doc(name))
+
+
+def _delegated_nonvector_property(name):
+    # Read straight from the native shape
+    return property(operator.attrgetter('_shape.' + name), doc=_shapely_doc(name))
+
+
+def _delegated_predicate(name):
+    def delegated_predicate(self_, other):
+        return getattr(self_._shape, name)(other.get_shape(self_.crs))
+
+    delegated_predicate.__name__ = name
+    delegated_predicate.__doc__ = _shapely_doc(name)
+    return delegated_predicate
+
+
+def _delegated_operation(name):
+    def delegated_operation(self_, other):
+        return self_.__class__(getattr(self_._shape, name)(other.get_shape(self_.crs)), self_.crs)
+
+    delegated_operation.__name__ = name
+    delegated_operation.__doc__ = _shapely_doc(name)
+    return delegated_operation
+
+
+def _delegated_operation_special(name):
+    def delegated_operation_special(self_, *args, **kwargs):
+        return self_.__class__(getattr(self_._shape, name)(*args, **kwargs), self_.crs)
+
+    delegated_operation_special.__name__ = name
+    delegated_operation_special.__doc__ = _shapely_doc(name)
+    return delegated_operation_special
+
+
+# Bind the delegated attributes once, instead of resolving them through __getattr__.
+# Attributes defined in the class body take precedence, and GEOM_PROPERTIES go first
+# so that 'exterior' returns a GeoVector.
+for _names, _delegate in [
+    (GEOM_PROPERTIES, _delegated_property),
+    (GEOM_NONVECTOR_PROPERTIES, _delegated_nonvector_property),
+    (GEOM_UNARY_PREDICATES, _delegated_nonvector_property),
+    (GEOM_BINARY_PREDICATES, _delegated_predicate),
+    (GEOM_BINARY_OPERATIONS, _delegated_operation),
+    (GEOM_UNARY_OPERATIONS, _delegated_operation_special),
+]:
+    for _name in _names:
+        if _name not in GeoVector.__dict__:
+            setattr(GeoVector, _name, _delegate(_name))
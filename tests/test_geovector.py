@@ -12,7 +12,7 @@ from telluric.vectors import (
     GeoVector,
     GEOM_PROPERTIES, GEOM_UNARY_PREDICATES, GEOM_UNARY_OPERATIONS, GEOM_BINARY_PREDICATES, GEOM_BINARY_OPERATIONS,
     generate_tile_coordinates, get_dimension,
-    generate_tile_coordinates_from_pixels)
+    generate_tile_coordinates_from_pixels, bulk_predicate, reproject_vectors)
 from telluric.constants import DEFAULT_CRS, WGS84_CRS
 
 
@@ -91,6 +91,35 @@ def test_reproject_same_projection_returns_same_object():
     assert new_gv is gv
 
 
+def test_reproject_vectors_matches_reproject():
+    utm_crs = {'init': 'epsg:32630'}
+    vectors = [
+        GeoVector(Point(0.0, 40.0)),
+        GeoVector(Polygon([(0, 40), (1, 40), (1, 41), (0, 41)])),
+        GeoVector(Point(500000, 4427757), utm_crs),
+        GeoVector(Point(-3.0, 40.0), utm_crs),
+    ]
+
+    new_vectors = reproject_vectors(vectors, utm_crs)
+
+    assert new_vectors[3] is vectors[3]
+    for vector, new_vector in zip(vectors, new_vectors):
+        assert new_vector.crs == utm_crs
+        assert new_vector.equals_exact(vector.reproject(utm_crs), 1e-6)
+
+
+def test_get_shape_reprojects_again_when_crs_changes_in_place():
+    crs = {'init': 'epsg:32630'}
+    gv = GeoVector(Point(0.0, 40.0))
+
+    first_shape = gv.get_shape(crs)
+    crs['init'] = 'epsg:32631'
+    second_shape = gv.get_shape(crs)
+
+    assert second_shape.equals_exact(gv.reproject({'init': 'epsg:32631'}).get_shape(crs), 1e-6)
+    assert not second_shape.equals_exact(first_shape, 1e-6)
+
+
 def test_reproject_respects_units():
     # See https://publicgitlab.satellogic.com/telluric/telluric/issues/87
 
@@ -189,6 +218,27 @@ def test_centroid():
     assert vector.centroid == expected_centroid
 
 
+def test_envelope_of_envelope_is_same_object():
+    vector = GeoVector(Polygon([(0, 0), (1, 0), (1, 2), (0, 2)]))
+
+    assert vector.envelope is vector
+
+
+def test_envelope_of_rectangle_in_other_order_matches_shapely():
+    vector = GeoVector.from_bounds(xmin=0, ymin=0, xmax=1, ymax=2)
+
+    assert vector.envelope is not vector
+    assert vector.envelope.get_shape(vector.crs) == vector.get_shape(vector.crs).envelope
+
+
+def test_envelope_of_non_rectangle():
+    vector = GeoVector(Polygon([(0, 0), (1, 0), (1, 2)]))
+    expected_envelope = GeoVector.from_bounds(xmin=0, ymin=0, xmax=1, ymax=2)
+
+    assert vector.envelope is not vector
+    assert vector.envelope == expected_envelope
+
+
 @pytest.mark.parametrize("property_name", GEOM_PROPERTIES)
 def test_delegated_properties(property_name):
     vector = GeoVector(Polygon([(0, 0), (1, 0), (1, 1), (0, 1)]))
@@ -239,6 +289,32 @@ def test_delegated_operations(operation_name):
             getattr(vector_1.get_shape(vector_1.crs), operation_name)(vector_2.get_shape(vector_2.crs)))
 
 
+def test_bulk_predicate():
+    vectors = [
+        GeoVector(Polygon([(0, 0), (1, 0), (1, 1), (0, 1)])),
+        GeoVector(Polygon([(5, 5), (6, 5), (6, 6), (5, 6)])),
+    ]
+    others = [
+        GeoVector(Polygon([(0.5, 0), (1.5, 0), (1.5, 1), (0.5, 1)])),
+        GeoVector(Point(10, 10)),
+        GeoVector(Point(0.5, 0.5)),
+    ]
+
+    assert bulk_predicate('intersects', vectors, others) == [[0, 2], []]
+    assert bulk_predicate('contains', vectors, others) == [[2], []]
+    assert bulk_predicate('intersects', vectors, []) == [[], []]
+    assert GeoVector.bulk_predicate('intersects', vectors, others) == [[0, 2], []]
+
+
+def test_bulk_predicate_raises_error_for_disjoint():
+    vector = GeoVector(Point(0, 0))
+
+    with pytest.raises(ValueError) as error:
+        bulk_predicate('disjoint', [vector], [vector])
+
+    assert "Predicate 'disjoint' can not be evaluated in bulk" in error.exconly()
+
+
 def test_generate_tile_coordinates():
     roi = GeoVector(Polygon([(0, 0), (1, 0), (1, 2), (0, 2)]))
     num_tiles = (10, 10)
@@ -272,6 +348,30 @@ def test_generate_tile_coordinates_in_pixels(pixel_size, resolution, length):
     assert len(tiles) == length
 
 
+def test_generate_tile_coordinates_in_pixels_bounds():
+    roi = GeoVector(Polygon([(0, 0), (10, 0), (10, 20), (0, 20)]))
+
+    tiles = list(generate_tile_coordinates_from_pixels(roi, 1.5, (1, 1)))
+
+    assert_array_almost_equal(tiles[0].get_shape(tiles[0].crs).bounds, (0.0, 0.0, 1.5, 1.5))
+    assert_array_almost_equal(tiles[1].get_shape(tiles[1].crs).bounds, (1.5, 0.0, 3.0, 1.5))
+    assert_array_almost_equal(tiles[-1].get_shape(tiles[-1].crs).bounds, (9.0, 19.5, 10.5, 21.0))
+
+
+def test_generate_tile_coordinates_in_pixels_share_edges():
+    roi = GeoVector(Polygon([(0.1, 0.1), (3.1, 0.1), (3.1, 2.2), (0.1, 2.2)]))
+
+    tiles = list(generate_tile_coordinates_from_pixels(roi, 0.3, (1, 1)))
+    bounds = [tile.get_shape(tile.crs).bounds for tile in tiles]
+
+    num_w = sum(1 for tile_bounds in bounds if tile_bounds[1] == bounds[0][1])
+    for ii in range(len(bounds) - 1):
+        if (ii + 1) % num_w:
+            assert bounds[ii][2] == bounds[ii + 1][0]
+    for ii in range(len(bounds) - num_w):
+        assert bounds[ii][3] == bounds[ii + num_w][1]
+
+
 def test_generate_tile_coordinates_in_pixels_raises_error_for_non_int_pixel_size():
     roi = GeoVector(Polygon([(0, 0), (10, 0), (10, 20), (0, 20)]))
 
@@ -460,6 +560,14 @@ def test_polygonize_line_square_cap_style():
     assert result == expected_result
 
 
+@pytest.mark.parametrize("shape", [LineString([(0, 0), (1, 1)]), Point([0, 0])])
+def test_polygonize_zero_width_is_empty(shape):
+    result = GeoVector(shape).polygonize(0)
+
+    assert result.is_empty
+    assert result.type == 'Polygon'
+
+
 def test_polygonize_point():
     point = GeoVector(Point([0, 0]))
     expected_bounds = (-0.5, -0.5, 0.5, 0.5)
@@ -473,6 +581,15 @@ def test_polygonize_point():
     assert result_shape.area == approx(expected_area, rel=1e-2)
 
 
+def test_polygonize_point_matches_buffer():
+    point = GeoVector(Point([1, 2]))
+    expected_result = GeoVector(Point([1, 2]).buffer(0.5))
+
+    result = point.polygonize(1)
+
+    assert result.equals_exact(expected_result, 1e-9)
+
+
 @mock.patch('telluric.rasterization.rasterize')
 def test_rasterize_without_bounds(mock_rasterize):
     gv = GeoVector(Polygon.from_bounds(0, 0, 1, 1))
@@ -1,4 +1,5 @@
-from shapely.geometry import Point
+from shapely import affinity
+from shapely.geometry import Point, Polygon, MultiPolygon
 from affine import Affine
 
 from telluric.util import projections
@@ -23,3 +24,33 @@ def test_transformation():
 
     transformed_shape = projections.transform(source_shape, source_crs, src_affine=tf)
     assert transformed_shape == Point(-1, -2)
+
+
+def test_transformation_is_cached():
+    destination_crs = {'init': 'epsg:32630'}
+
+    first = projections.generate_transform(source_crs, destination_crs)
+    second = projections.generate_transform(dict(source_crs), dict(destination_crs))
+
+    assert first.args[0] is second.args[0]
+
+
+def test_transform_shape_keeps_holes_and_parts():
+    shell = [(0, 0), (10, 0), (10, 10), (0, 10)]
+    hole = [(2, 2), (4, 2), (4, 4), (2, 4)]
+    shape = MultiPolygon([Polygon(shell, [hole]), Polygon.from_bounds(20, 20, 30, 30)])
+
+    transformed_shape = projections._transform_shape(lambda xx, yy: (xx + 1, yy - 1), shape)
+
+    assert transformed_shape.equals(affinity.translate(shape, 1, -1))
+    assert len(transformed_shape.geoms[0].interiors) == 1
+
+
+def test_projections_are_shared_between_transformations():
+    utm_crs = {'init': 'epsg:32633'}
+
+    projections.generate_transform(source_crs, utm_crs)
+    hits = projections._get_proj.cache_info().hits
+    projections.generate_transform(utm_crs, source_crs)
+
+    assert projections._get_proj.cache_info().hits == hits + 2